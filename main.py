@@ -1,18 +1,65 @@
-from fastapi import FastAPI, Depends, HTTPException
+import os
+import orjson
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
 from pydantic import BaseModel
 from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func
-from sqlalchemy.orm import relationship, Session
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, and_, bindparam, func, insert, inspect, lambda_stmt, select, update, event
+from sqlalchemy.orm import column_property, relationship, selectinload, raiseload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from datetime import datetime
+
+
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    connect_args={"timeout": 30},
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+# GET routes use a separate pool whose connections refuse writes.
+read_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    connect_args={"timeout": 30},
+)
 
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+@event.listens_for(read_engine.sync_engine, "connect")
+def set_read_only_pragmas(dbapi_connection, connection_record):
+    set_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.close()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession)
+AsyncSessionLocalRead = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=read_engine, class_=AsyncSession)
 Base = declarative_base()
 
 
@@ -30,12 +77,38 @@ class Transaction(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String, index=True)
-    amount = Column(Float)
+    # active_history loads the old value on change so the category_totals listener can undo it.
+    amount = column_property(Column(Float), active_history=True)
     date = Column(DateTime, default=datetime.utcnow)
-    category = Column(String)
+    year_month = Column(String(7))
+    category = column_property(Column(String), active_history=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     user = relationship("User", back_populates="transactions")
 
+    __table_args__ = (
+        Index("ix_tx_date", "date"),
+        Index("ix_tx_user_date", "user_id", "date"),
+        Index("ix_tx_user_cat_amount", "user_id", "category", "amount"),
+        Index("ix_tx_cat_amount", "category", "amount"),
+        Index("ix_tx_user_month_amount", "user_id", "year_month", "amount"),
+    )
+
+
+def resolve_transaction_date(date):
+    date = date or datetime.utcnow()
+    return date, date.strftime("%Y-%m")
+
+
+@event.listens_for(Transaction, "before_insert")
+def set_year_month(mapper, connection, target):
+    target.date, target.year_month = resolve_transaction_date(target.date)
+
+
+@event.listens_for(Transaction, "before_update")
+def update_year_month(mapper, connection, target):
+    target.year_month = target.date.strftime("%Y-%m") if target.date is not None else None
+
+
 class Budget(Base):
     __tablename__ = "budgets"
 
@@ -48,7 +121,68 @@ class Budget(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     user = relationship("User", back_populates="budgets")
 
-Base.metadata.create_all(bind=engine)
+    __table_args__ = (
+        Index("ix_budget_user_amount", "user_id", "amount"),
+        Index("ix_budget_cat", "category"),
+    )
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    id = Column(Integer, primary_key=True)
+    tx_count = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(Transaction, "after_insert")
+def increment_tx_count(mapper, connection, target):
+    connection.execute(update(Counter).where(Counter.id == 1).values(tx_count=Counter.tx_count + 1))
+
+
+@event.listens_for(Transaction, "after_delete")
+def decrement_tx_count(mapper, connection, target):
+    connection.execute(update(Counter).where(Counter.id == 1).values(tx_count=Counter.tx_count - 1))
+
+
+class CategoryTotal(Base):
+    __tablename__ = "category_totals"
+
+    category = Column(String, primary_key=True)
+    total_spent = Column(Float, nullable=False, default=0, index=True)
+
+
+def adjust_category_total(category, delta):
+    stmt = sqlite_insert(CategoryTotal).values(category=category, total_spent=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=[CategoryTotal.category],
+        set_={"total_spent": CategoryTotal.total_spent + stmt.excluded.total_spent},
+    )
+
+
+@event.listens_for(Transaction, "after_insert")
+def add_to_category_total(mapper, connection, target):
+    if target.category is not None:
+        connection.execute(adjust_category_total(target.category, target.amount or 0))
+
+
+@event.listens_for(Transaction, "after_delete")
+def subtract_from_category_total(mapper, connection, target):
+    if target.category is not None:
+        connection.execute(adjust_category_total(target.category, -(target.amount or 0)))
+
+
+@event.listens_for(Transaction, "after_update")
+def move_category_total(mapper, connection, target):
+    state = inspect(target)
+    amount_history = state.attrs.amount.history
+    category_history = state.attrs.category.history
+    if not amount_history.has_changes() and not category_history.has_changes():
+        return
+    old_amount = amount_history.deleted[0] if amount_history.deleted else target.amount
+    old_category = category_history.deleted[0] if category_history.deleted else target.category
+    if old_category is not None:
+        connection.execute(adjust_category_total(old_category, -(old_amount or 0)))
+    if target.category is not None:
+        connection.execute(adjust_category_total(target.category, target.amount or 0))
 
 
 class UserCreate(BaseModel):
@@ -69,151 +203,342 @@ class BudgetCreate(BaseModel):
     end_date: datetime
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+TRANSACTIONS_BY_CATEGORY_STMT = lambda_stmt(
+    lambda: select(Transaction).options(raiseload('*')).where(Transaction.category == bindparam("category"))
+)
+TOTAL_SPENT_STMT = lambda_stmt(
+    lambda: select(func.sum(Transaction.amount)).where(Transaction.user_id == bindparam("user_id"))
+)
+BUDGET_SPENDING_STMT = lambda_stmt(
+    lambda: select(Budget.amount, func.coalesce(func.sum(Transaction.amount), 0))
+    .outerjoin(Transaction, and_(Transaction.user_id == Budget.user_id, Transaction.category == Budget.category))
+    .where(Budget.id == bindparam("budget_id"))
+    .group_by(Budget.id)
+)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_db():
+    async with AsyncSessionLocalRead() as session:
+        yield session
+
+
+async def get_budget_spending(budget_id: int, db: AsyncSession):
+    row = (await db.execute(BUDGET_SPENDING_STMT, {"budget_id": budget_id})).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return row
+
+
+ANALYTICS_NAMESPACE = "analytics"
+ANALYTICS_CACHE_EXPIRE = 60
+
+
+def request_key_builder(_func, namespace: str = "", *, request: Request = None, response: Response = None, args=(), kwargs=None, include_query: bool = True):
+    key = f"{namespace}:{request.url.path}"
+    return f"{key}?{request.query_params}" if include_query else key
+
+
+def path_key_builder(_func, namespace: str = "", *, request: Request = None, response: Response = None, args=(), kwargs=None):
+    return request_key_builder(_func, namespace, request=request, include_query=False)
+
+
+async def invalidate_analytics():
+    await FastAPICache.clear(namespace=ANALYTICS_NAMESPACE)
+
+
+def create_missing_indexes(sync_conn):
+    created = False
+    inspector = inspect(sync_conn)
+    for table in (Transaction.__table__, Budget.__table__):
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(sync_conn)
+                created = True
+    return created
+
+
+async def migrate_schema(conn):
+    # create_all skips existing tables, so bring older databases up to the current schema here.
+    columns = [row[1] for row in (await conn.exec_driver_sql("PRAGMA table_info(transactions)")).all()]
+    changed = False
+    if "year_month" not in columns:
+        await conn.exec_driver_sql("ALTER TABLE transactions ADD COLUMN year_month VARCHAR(7)")
+        await conn.exec_driver_sql("UPDATE transactions SET year_month = strftime('%Y-%m', date)")
+        changed = True
+    if await conn.run_sync(create_missing_indexes):
+        changed = True
+    # Only refresh planner statistics when the schema moved; PRAGMA optimize covers the rest on shutdown.
+    if changed:
+        await conn.exec_driver_sql("ANALYZE")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await migrate_schema(conn)
+        await conn.execute(
+            sqlite_insert(Counter)
+            .values(id=1, tx_count=select(func.count()).select_from(Transaction).scalar_subquery())
+            .on_conflict_do_nothing()
+        )
+        await conn.execute(sqlite_insert(CategoryTotal).from_select(
+            ["category", "total_spent"],
+            select(Transaction.category, func.sum(Transaction.amount)).where(Transaction.category.is_not(None)).group_by(Transaction.category),
+        ).on_conflict_do_nothing())
+    FastAPICache.init(InMemoryBackend())
+    yield
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+    await engine.dispose()
+    await read_engine.dispose()
 
 app = FastAPI(
     title="BudgetEase: Personal Finance Manager",
     description="Manage personal finances, track transactions and budgets.",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
+sql_statements: ContextVar[Optional[List[str]]] = ContextVar("sql_statements", default=None)
+
+
+def record_sql_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = sql_statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+async def count_sql_statements(request: Request, call_next):
+    token = sql_statements.set([])
+    try:
+        response = await call_next(request)
+        response.headers["X-SQL-Count"] = str(len(sql_statements.get()))
+    finally:
+        sql_statements.reset(token)
+    return response
+
+
+def enable_sql_count(app: FastAPI):
+    """Add an X-SQL-Count header with the number of statements each request ran."""
+    if getattr(app.state, "sql_count_enabled", False):
+        return
+    app.state.sql_count_enabled = True
+    event.listen(engine.sync_engine, "before_cursor_execute", record_sql_statement)
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record_sql_statement)
+    app.add_middleware(BaseHTTPMiddleware, dispatch=count_sql_statements)
+
+
+if os.environ.get("DEBUG_SQL_COUNT") == "1":
+    enable_sql_count(app)
+
 
 @app.post("/users/", response_model=UserCreate)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     db_user = User(name=user.name, email=user.email)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     return db_user
 
 
+@app.post("/users/bulk/", response_model=List[UserCreate])
+async def create_users_bulk(users: List[UserCreate], db: AsyncSession = Depends(get_db)):
+    if users:
+        await db.execute(insert(User), [user.dict() for user in users])
+        await db.commit()
+    return users
+
+
 @app.get("/users/{user_id}", response_model=UserCreate)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    db_user = await db.get(User, user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
 
 @app.put("/users/{user_id}", response_model=UserCreate)
-def update_user(user_id: int, user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
+async def update_user(user_id: int, user: UserCreate, db: AsyncSession = Depends(get_db)):
+    stmt = update(User).where(User.id == user_id).values(**user.dict(exclude_unset=True)).returning(User.name, User.email)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    for key, value in user.dict(exclude_unset=True).items():
-        setattr(db_user, key, value)
-    db.commit()
-    return db_user
+    await db.commit()
+    return row._mapping
 
 
 @app.delete("/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    db.delete(db_user)
-    db.commit()
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    async with db.begin():
+        db_user = await db.get(User, user_id, options=[selectinload(User.transactions), selectinload(User.budgets)])
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        await db.delete(db_user)
+    await invalidate_analytics()
     return {"message": "User deleted"}
 
 
 @app.get("/users/email/{email}", response_model=List[UserCreate])
-def filter_users_by_email(email: str, db: Session = Depends(get_db)):
-    return db.query(User).filter(User.email == email).all()
+async def filter_users_by_email(email: str, db: AsyncSession = Depends(get_read_db)):
+    return (await db.execute(select(User).options(raiseload('*')).where(User.email == email))).scalars().all()
 
 
-@app.get("/transactions/date/", response_model=List[TransactionCreate])
-def filter_transactions_by_date(start_date: datetime, end_date: datetime, db: Session = Depends(get_db)):
-    return db.query(Transaction).filter(Transaction.date >= start_date, Transaction.date <= end_date).all()
+@app.post("/transactions/user/{user_id}", response_model=TransactionCreate)
+async def create_transaction(user_id: int, transaction: TransactionCreate, db: AsyncSession = Depends(get_db)):
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    db_transaction = Transaction(**transaction.dict(), user_id=user_id)
+    db.add(db_transaction)
+    await db.commit()
+    await invalidate_analytics()
+    return db_transaction
+
+
+@app.post("/transactions/user/{user_id}/bulk/", response_model=List[TransactionCreate])
+async def create_transactions_bulk(user_id: int, transactions: List[TransactionCreate], db: AsyncSession = Depends(get_db)):
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    rows = []
+    for transaction in transactions:
+        date, year_month = resolve_transaction_date(transaction.date)
+        rows.append({**transaction.dict(), "date": date, "year_month": year_month, "user_id": user_id})
+    if rows:
+        # A Core insert on the session's connection skips the mapper events,
+        # so keep the counter and category totals in step by hand.
+        conn = await db.connection()
+        await conn.execute(insert(Transaction), rows)
+        await conn.execute(update(Counter).where(Counter.id == 1).values(tx_count=Counter.tx_count + len(rows)))
+        category_deltas = {}
+        for row in rows:
+            category_deltas[row["category"]] = category_deltas.get(row["category"], 0) + row["amount"]
+        for category, delta in category_deltas.items():
+            await conn.execute(adjust_category_total(category, delta))
+        await db.commit()
+        await invalidate_analytics()
+    return rows
+
+
+STREAM_BATCH_SIZE = 1000
+
+
+@app.get("/transactions/date/", response_model=None, responses={200: {"model": List[TransactionCreate]}})
+async def filter_transactions_by_date(start_date: datetime, end_date: datetime) -> StreamingResponse:
+    stmt = (
+        select(Transaction.description, Transaction.amount, Transaction.category, Transaction.date)
+        .where(Transaction.date >= start_date, Transaction.date <= end_date)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+    async def generate():
+        # The session lives inside the generator so it stays open until the last batch is sent.
+        async with AsyncSessionLocalRead() as db:
+            yield b"["
+            first = True
+            async for batch in (await db.stream(stmt)).partitions():
+                prefix = b"" if first else b","
+                yield prefix + b",".join(orjson.dumps(dict(row._mapping)) for row in batch)
+                first = False
+            yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @app.get("/transactions/category/{category}", response_model=List[TransactionCreate])
-def filter_transactions_by_category(category: str, db: Session = Depends(get_db)):
-    return db.query(Transaction).filter(Transaction.category == category).all()
+async def filter_transactions_by_category(category: str, db: AsyncSession = Depends(get_read_db)):
+    return (await db.execute(TRANSACTIONS_BY_CATEGORY_STMT, {"category": category})).scalars().all()
 
 
-@app.get("/transactions/user/{user_id}", response_model=List[TransactionCreate])
-def get_transactions_for_user(user_id: int, db: Session = Depends(get_db)):
-    return db.query(Transaction).filter(Transaction.user_id == user_id).all()
+@app.get("/transactions/user/{user_id}", responses={200: {"model": List[TransactionCreate]}})
+async def get_transactions_for_user(user_id: int, db: AsyncSession = Depends(get_read_db)) -> Response:
+    rows = (await db.execute(select(Transaction.description, Transaction.amount, Transaction.category, Transaction.date).where(Transaction.user_id == user_id))).all()
+    return Response(orjson.dumps([dict(row._mapping) for row in rows]), media_type="application/json")
 
 
 @app.get("/transactions/total_spent/{user_id}")
-def get_total_spent(user_id: int, db: Session = Depends(get_db)):
-    total_spent = db.query(func.sum(Transaction.amount)).filter(Transaction.user_id == user_id).scalar()
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_total_spent(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    total_spent = await db.scalar(TOTAL_SPENT_STMT, {"user_id": user_id})
     return {"total_spent": total_spent}
 
 
 @app.get("/transactions/count/")
-def get_total_transactions_count(db: Session = Depends(get_db)):
-    return {"total_transactions": db.query(Transaction).count()}
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_total_transactions_count(db: AsyncSession = Depends(get_read_db)):
+    return {"total_transactions": await db.scalar(select(Counter.tx_count).where(Counter.id == 1))}
 
 
 @app.get("/budgets/category/{category}", response_model=List[BudgetCreate])
-def filter_budgets_by_category(category: str, db: Session = Depends(get_db)):
-    return db.query(Budget).filter(Budget.category == category).all()
+async def filter_budgets_by_category(category: str, db: AsyncSession = Depends(get_read_db)):
+    return (await db.execute(select(Budget).options(raiseload('*')).where(Budget.category == category))).scalars().all()
 
 
 @app.get("/budgets/user/{user_id}", response_model=List[BudgetCreate])
-def get_budgets_for_user(user_id: int, db: Session = Depends(get_db)):
-    return db.query(Budget).filter(Budget.user_id == user_id).all()
+async def get_budgets_for_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    return (await db.execute(select(Budget).options(raiseload('*')).where(Budget.user_id == user_id))).scalars().all()
 
 
 @app.get("/budgets/total/{user_id}")
-def get_total_budget(user_id: int, db: Session = Depends(get_db)):
-    total_budget = db.query(func.sum(Budget.amount)).filter(Budget.user_id == user_id).scalar()
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_total_budget(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    total_budget = await db.scalar(select(func.sum(Budget.amount)).where(Budget.user_id == user_id))
     return {"total_budget": total_budget}
 
 
 @app.put("/budgets/extend/{budget_id}")
-def extend_budget(budget_id: int, new_end_date: datetime, db: Session = Depends(get_db)):
-    db_budget = db.query(Budget).filter(Budget.id == budget_id).first()
-    if not db_budget:
+async def extend_budget(budget_id: int, new_end_date: datetime, db: AsyncSession = Depends(get_db)):
+    stmt = update(Budget).where(Budget.id == budget_id).values(end_date=new_end_date).returning(*Budget.__table__.columns)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Budget not found")
-    db_budget.end_date = new_end_date
-    db.commit()
-    return db_budget
+    await db.commit()
+    return dict(row._mapping)
 
 
 @app.get("/budgets/exceeded/{budget_id}")
-def check_budget_exceeded(budget_id: int, db: Session = Depends(get_db)):
-    db_budget = db.query(Budget).filter(Budget.id == budget_id).first()
-    total_spent = db.query(func.sum(Transaction.amount)).filter(Transaction.user_id == db_budget.user_id, Transaction.category == db_budget.category).scalar()
-    return {"budget_exceeded": total_spent > db_budget.amount}
+async def check_budget_exceeded(budget_id: int, db: AsyncSession = Depends(get_read_db)):
+    budget_amount, total_spent = await get_budget_spending(budget_id, db)
+    return {"budget_exceeded": total_spent > budget_amount}
 
 
 @app.get("/analytics/spending/category/{category}")
-def get_total_spending_by_category(category: str, db: Session = Depends(get_db)):
-    total_spent = db.query(func.sum(Transaction.amount)).filter(Transaction.category == category).scalar()
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_total_spending_by_category(category: str, db: AsyncSession = Depends(get_read_db)):
+    total_spent = await db.scalar(select(func.sum(Transaction.amount)).where(Transaction.category == category))
     return {"total_spent": total_spent}
 
 
 @app.get("/analytics/transactions/category/{category}")
-def get_transactions_count_by_category(category: str, db: Session = Depends(get_db)):
-    count = db.query(Transaction).filter(Transaction.category == category).count()
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_transactions_count_by_category(category: str, db: AsyncSession = Depends(get_read_db)):
+    count = await db.scalar(select(func.count()).select_from(Transaction).where(Transaction.category == category))
     return {"count": count}
 
 
 @app.get("/analytics/budget/utilization/{budget_id}")
-def get_budget_utilization(budget_id: int, db: Session = Depends(get_db)):
-    db_budget = db.query(Budget).filter(Budget.id == budget_id).first()
-    total_spent = db.query(func.sum(Transaction.amount)).filter(Transaction.user_id == db_budget.user_id, Transaction.category == db_budget.category).scalar()
-    utilization = total_spent / db_budget.amount if db_budget.amount > 0 else 0
+async def get_budget_utilization(budget_id: int, db: AsyncSession = Depends(get_read_db)):
+    budget_amount, total_spent = await get_budget_spending(budget_id, db)
+    utilization = total_spent / budget_amount if budget_amount > 0 else 0
     return {"utilization": utilization}
 
 
 @app.get("/analytics/spending/monthly/{user_id}")
-def get_monthly_spending_report(user_id: int, db: Session = Depends(get_db)):
-    start_date = datetime.now().replace(day=1)
-    end_date = (start_date + timedelta(days=31)).replace(day=1)
-    monthly_spending = db.query(func.sum(Transaction.amount)).filter(Transaction.user_id == user_id, Transaction.date >= start_date, Transaction.date < end_date).scalar()
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=request_key_builder)
+async def get_monthly_spending_report(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    year_month = datetime.utcnow().strftime("%Y-%m")
+    monthly_spending = await db.scalar(select(func.sum(Transaction.amount)).where(Transaction.user_id == user_id, Transaction.year_month == year_month))
     return {"monthly_spending": monthly_spending}
 
 
 @app.get("/analytics/spending/highest")
-def get_highest_spending_category(db: Session = Depends(get_db)):
-    result = db.query(Transaction.category, func.sum(Transaction.amount).label('total_spent')).group_by(Transaction.category).order_by(func.sum(Transaction.amount).desc()).first()
-    return {"category": result[0], "total_spent": result[1]}
+@cache(expire=ANALYTICS_CACHE_EXPIRE, namespace=ANALYTICS_NAMESPACE, key_builder=path_key_builder)
+async def get_highest_spending_category(db: AsyncSession = Depends(get_read_db)):
+    result = (await db.execute(select(CategoryTotal).order_by(CategoryTotal.total_spent.desc()).limit(1))).scalar_one_or_none()
+    if result is None:
+        return {"category": None, "total_spent": None}
+    return {"category": result.category, "total_spent": result.total_spent}
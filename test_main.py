@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+
+DB_DIR = tempfile.mkdtemp()
+DB_PATH = os.path.join(DB_DIR, "test.db")
+# The engine is built at import time, so point it away from the committed test.db first.
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    main.enable_sql_count(main.app)
+    with TestClient(main.app) as client:
+        # The in-memory cache store is shared across app restarts, so start each test empty.
+        client.portal.call(main.invalidate_analytics)
+        yield client
+    FastAPICache.reset()
+
+
+def test_get_user_runs_one_query(client):
+    client.post("/users/", json={"name": "Alice", "email": "alice@example.com"})
+    response = client.get("/users/1")
+    assert response.status_code == 200
+    assert response.headers["X-SQL-Count"] == "1"
+
+
+def test_cached_analytics_hit_runs_no_queries(client):
+    first = client.get("/transactions/count/")
+    second = client.get("/transactions/count/")
+    assert first.headers["X-FastAPI-Cache"] == "MISS"
+    assert second.headers["X-FastAPI-Cache"] == "HIT"
+    assert second.headers["X-SQL-Count"] == "0"